@@ -362,8 +362,10 @@ def concat_columns(args: list):
             axis=1,
         )
     elif isinstance(args[0], pd.DataFrame):
+        # Only the indices need replacing, so avoid the deep copies made by
+        # `reset_index` and copy the column data once, in the concat itself
         return pd.concat(
-            [a.reset_index(drop=True) for a in args],
+            [_with_default_index(a) for a in args],
             axis=1,
         )
     elif isinstance(args[0], DictLike):
@@ -374,6 +376,16 @@ def concat_columns(args: list):
     return None
 
 
+def _with_default_index(df: pd.DataFrame) -> pd.DataFrame:
+    # Equivalent to `df.reset_index(drop=True)` without copying the column data
+    index = df.index
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        return df
+    df = df.copy(deep=False)
+    df.index = pd.RangeIndex(len(df))
+    return df
+
+
 def read_parquet_dispatch(df: DataFrameLike) -> Callable:
     """Dispatch function for reading parquet files"""
     return read_dispatch(df=df, fmt="parquet")
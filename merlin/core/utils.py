@@ -13,32 +13,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import atexit
+import contextlib
+import functools
 import gzip
+import hashlib
 import importlib
 import os
 import shutil
 import tarfile
+import time
 import urllib.request
+import uuid
 import warnings
+import weakref
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from contextvars import ContextVar
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional, Sequence
 
 import dask
 import distributed
-from dask.dataframe.optimize import optimize as dd_optimize
-from dask.distributed import Client, get_client
-from tqdm import tqdm
 
 from merlin.core.compat import HAS_GPU, cuda
 
-_merlin_dask_client = ContextVar("_merlin_dask_client", default="auto")
-
-
 try:
-    import psutil
+    from distributed.client import _get_global_client
 except ImportError:
-    psutil = None
+    _get_global_client = None
+
+_merlin_dask_client = ContextVar("_merlin_dask_client", default="auto")
+
+# Set when a global-client probe in the current context finds nothing,
+# so that later lookups can skip probing until `set_dask_client` is called
+_no_client_probe = ContextVar("_no_client_probe", default=False)
+
+# Read size used when streaming downloads to disk
+_DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# How long (in seconds) a download can wait to connect or for more data
+_DOWNLOAD_TIMEOUT = 60
+# Downloads smaller than this are not worth rendering a progress bar for
+_PROGRESS_MIN_SIZE = 512 * 1024
+# Buffer size used when decompressing/extracting downloaded archives
+_COPY_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Local cluster classes that `set_dask_client` can deploy,
+# as (module name, class name) pairs
+_CLUSTER_CLASSES = {
+    "cuda": ("dask_cuda", "LocalCUDACluster"),
+    "cpu": ("distributed", "LocalCluster"),
+}
+
+# How long (in seconds) a "free" device-memory query from NVML is reused for
+_FREE_MEM_TTL = 0.1
+_nvml_free_cache: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _psutil():
+    # psutil is optional, and only imported on first use
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    return psutil
 
 
 def pynvml_mem_size(kind="total", index=0):
@@ -61,18 +99,45 @@ def pynvml_mem_size(kind="total", index=0):
     ValueError
         When kind is not one of {"free", "total"}
     """
-    import pynvml
-
-    pynvml.nvmlInit()
-    size = None
     if kind == "free":
-        size = int(pynvml.nvmlDeviceGetMemoryInfo(pynvml.nvmlDeviceGetHandleByIndex(index)).free)
+        # Free memory changes, but not fast enough to be
+        # worth querying NVML more than every `_FREE_MEM_TTL`
+        now = time.monotonic()
+        cached = _nvml_free_cache.get(index)
+        if cached is not None and now - cached[0] < _FREE_MEM_TTL:
+            return cached[1]
+        size = int(_nvml_memory_info(index).free)
+        _nvml_free_cache[index] = (now, size)
+        return size
     elif kind == "total":
-        size = int(pynvml.nvmlDeviceGetMemoryInfo(pynvml.nvmlDeviceGetHandleByIndex(index)).total)
+        return _nvml_total_mem(index)
     else:
         raise ValueError(f"{kind} not a supported option for device_mem_size.")
-    pynvml.nvmlShutdown()
-    return size
+
+
+@functools.lru_cache(maxsize=None)
+def _nvml():
+    # Initialize NVML once per process, rather than on every query
+    import pynvml
+
+    pynvml.nvmlInit()
+    atexit.register(pynvml.nvmlShutdown)
+    return pynvml
+
+
+def _nvml_memory_info(index):
+    pynvml = _nvml()
+    return pynvml.nvmlDeviceGetMemoryInfo(pynvml.nvmlDeviceGetHandleByIndex(index))
+
+
+@functools.lru_cache(maxsize=None)
+def _nvml_total_mem(index):
+    return int(_nvml_memory_info(index).total)
+
+
+@functools.lru_cache(maxsize=None)
+def _cpu_total_mem():
+    return _psutil().virtual_memory().total
 
 
 def device_mem_size(kind="total", cpu=False):
@@ -96,9 +161,10 @@ def device_mem_size(kind="total", cpu=False):
         When kind is provided with an unsupported value.
     """
     # Use psutil (if available) for cpu mode
+    psutil = _psutil() if cpu else None
     if cpu and psutil:
         if kind == "total":
-            return psutil.virtual_memory().total
+            return _cpu_total_mem()
         elif kind == "free":
             return psutil.virtual_memory().free
     elif cpu:
@@ -122,49 +188,177 @@ def device_mem_size(kind="total", cpu=False):
 
 
 def get_rmm_size(size):
-    return (size // 256) * 256
+    # Round down to a multiple of 256 bytes. Sizes are often computed as
+    # a fraction of device memory, so accept floats as well as ints
+    return int(size) & ~0xFF
 
 
-def download_file(url, local_filename, unzip_files=True, redownload=True):
+def download_file(url, local_filename, unzip_files=True, redownload=True, expected_sha256=None):
     """utility function to download a dataset file (movielens/criteo/rossmann etc)
-    locally, displaying a progress bar during download"""
+    locally, displaying a progress bar during download. If `expected_sha256` is
+    provided, the file is verified against it and a ValueError is raised on mismatch"""
     local_filename = os.path.abspath(local_filename)
     path = os.path.dirname(local_filename)
-    if not os.path.exists(path):
-        os.makedirs(path, exist_ok=True)
+    os.makedirs(path, exist_ok=True)
 
     if not url.startswith("http"):
         raise ValueError(f"Unhandled url scheme on {url} - this function only is for http")
 
-    if redownload or not os.path.exists(local_filename):
-        desc = f"downloading {os.path.basename(local_filename)}"
-        with tqdm(unit="B", unit_scale=True, desc=desc) as progress:
-
-            def report(chunk, chunksize, total):
-                if not progress.total:
-                    progress.reset(total=total)
-                progress.update(chunksize)
+    from tqdm import tqdm
 
-            opener = urllib.request.build_opener()
-            opener.addheaders = [("Accept-Encoding", "gzip, deflate"), ("Accept", "*/*")]
+    # Download unless there's an existing file to keep (one that
+    # passes verification, when a hash is given)
+    needs_download = (
+        redownload
+        or not os.path.exists(local_filename)
+        or bool(expected_sha256 and _file_sha256(local_filename) != expected_sha256.lower())
+    )
 
-            urllib.request.install_opener(opener)
-            urllib.request.urlretrieve(url, local_filename, reporthook=report)  # nosec
+    if needs_download:
+        # Stream to a temporary file in the same directory and move it into place
+        # once the download is complete and verified. That way a failed download
+        # never leaves a partial file behind, or removes a file that was already there
+        temp_filename = os.path.join(
+            path, f".{os.path.basename(local_filename)}.{uuid.uuid4().hex}.part"
+        )
+        # Created like any new file (so the umask applies), but exclusively
+        fd = os.open(temp_filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            # Hash the data as it's streamed, to avoid a second pass over the file
+            digest = hashlib.sha256() if expected_sha256 else None
+            with open(fd, "wb") as output_file, _open_url(url) as (total, chunks):
+                desc = f"downloading {os.path.basename(local_filename)}"
+                # Skip the progress bar for small files, and throttle its
+                # refresh rate otherwise, since rendering can dominate the cost
+                with tqdm(
+                    unit="B",
+                    unit_scale=True,
+                    desc=desc,
+                    total=total or None,
+                    mininterval=0.25,
+                    disable=0 < total < _PROGRESS_MIN_SIZE,
+                ) as progress:
+                    for chunk in chunks:
+                        output_file.write(chunk)
+                        if digest is not None:
+                            digest.update(chunk)
+                        progress.update(len(chunk))
+
+            if digest is not None and digest.hexdigest() != expected_sha256.lower():
+                raise ValueError(
+                    f"SHA-256 mismatch for {url}: expected {expected_sha256}, "
+                    f"got {digest.hexdigest()}"
+                )
+
+            os.replace(temp_filename, local_filename)
+        except BaseException:
+            os.remove(temp_filename)
+            raise
 
     if unzip_files and local_filename.endswith(".zip"):
-        with zipfile.ZipFile(local_filename) as z:
-            for filename in tqdm(z.infolist(), desc="unzipping files", unit="files"):
-                z.extract(filename, path)
+        _extract_zip(local_filename, path)
 
     elif unzip_files and local_filename.endswith(".tgz"):
-        with tarfile.open(local_filename, "r") as tar:
-            for filename in tqdm(tar.getnames(), desc="untarring files", unit="files"):
-                tar.extract(filename, path)
+        with tarfile.open(local_filename, "r", copybufsize=_COPY_BUFFER_SIZE) as tar:
+            # Extract by TarInfo, since extracting by name
+            # rescans the archive's member list for every file
+            for member in tqdm(tar.getmembers(), desc="untarring files", unit="files"):
+                tar.extract(member, path)
 
     elif unzip_files and local_filename.endswith(".gz"):
         with gzip.open(local_filename, "rb") as input_file:
             with open(local_filename[:-3], "wb") as output_file:
-                shutil.copyfileobj(input_file, output_file)
+                shutil.copyfileobj(input_file, output_file, _COPY_BUFFER_SIZE)
+
+
+def _file_sha256(filename):
+    with open(filename, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+ hashes the file in an optimized C loop
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        for chunk in iter(functools.partial(f.read, _DOWNLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+@contextlib.contextmanager
+def _open_url(url):
+    # Yields the content length (0 if unknown) and an iterator over chunks of the
+    # response body. Both backends ask for the body without any content encoding,
+    # and `requests` is kept from decoding one a server applies anyway (urllib
+    # doesn't decode), so the file written doesn't depend on the backend used
+    session = _requests_session()
+    if session is not None:
+        headers = {"Accept-Encoding": "identity"}
+        with session.get(url, stream=True, headers=headers, timeout=_DOWNLOAD_TIMEOUT) as response:
+            response.raise_for_status()
+            total = int(response.headers.get("Content-Length", 0))
+            yield total, response.raw.stream(_DOWNLOAD_CHUNK_SIZE, decode_content=False)
+    else:
+        with _urllib_opener().open(url, timeout=_DOWNLOAD_TIMEOUT) as response:  # nosec
+            total = int(response.headers.get("Content-Length", 0))
+            yield total, iter(functools.partial(response.read, _DOWNLOAD_CHUNK_SIZE), b"")
+
+
+@functools.lru_cache(maxsize=None)
+def _requests_session():
+    # requests is optional. When it's available, a single shared session
+    # keeps connections alive across downloads from the same host
+    try:
+        import requests
+    except ImportError:
+        return None
+    return requests.Session()
+
+
+@functools.lru_cache(maxsize=None)
+def _urllib_opener():
+    opener = urllib.request.build_opener()
+    opener.addheaders = [("Accept-Encoding", "identity"), ("Accept", "*/*")]
+    return opener
+
+
+def _extract_zip(local_filename, path):
+    # Extract zip members concurrently. ZipFile handles can't be shared
+    # between threads, so each worker opens its own and extracts a batch
+    from tqdm import tqdm
+
+    with zipfile.ZipFile(local_filename) as z:
+        members = z.infolist()
+
+    num_workers = max(1, min(8, os.cpu_count() or 1, len(members)))
+    # Striding over the members keeps the batches balanced
+    batches = [members[i::num_workers] for i in range(num_workers)]
+
+    with tqdm(total=len(members), desc="unzipping files", unit="files") as progress:
+
+        def extract(batch):
+            with zipfile.ZipFile(local_filename) as archive:
+                for member in batch:
+                    _extract_zip_member(archive, member, path)
+                    progress.update(1)
+
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            for future in [executor.submit(extract, batch) for batch in batches]:
+                future.result()
+
+
+def _extract_zip_member(archive, member, path):
+    # Equivalent to `archive.extract(member, path)`, but copies
+    # the decompressed data using a much larger buffer
+    root = os.path.realpath(path)
+    target = os.path.realpath(os.path.join(root, member.filename))
+    if os.path.commonpath([root, target]) != root:
+        raise ValueError(f"Refusing to extract {member.filename} outside of {path}")
+
+    if member.is_dir():
+        os.makedirs(target, exist_ok=True)
+        return
+
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with archive.open(member) as source, open(target, "wb") as dest:
+        shutil.copyfileobj(source, dest, _COPY_BUFFER_SIZE)
 
 
 def ensure_optimize_dataframe_graph(ddf=None, dsk=None, keys=None):
@@ -209,8 +403,27 @@ def ensure_optimize_dataframe_graph(ddf=None, dsk=None, keys=None):
     keys = ddf.__dask_keys__() if keys is None else keys
 
     if isinstance(dsk, dask.highlevelgraph.HighLevelGraph):
-        with dask.config.set({"optimization.fuse.active": False}):
-            dsk = dd_optimize(dsk, keys=keys)
+        from dask.blockwise import Blockwise
+
+        # The DataFrame optimizations (column projection and Blockwise
+        # fusion) only apply to Blockwise layers, so there is nothing to
+        # gain from optimizing a graph that doesn't contain any
+        if any(isinstance(layer, Blockwise) for layer in dsk.layers.values()):
+            # HLG fusion already handles Blockwise layers. Low-level fusion is only
+            # enabled when non-Blockwise layers that combine other layers (joins,
+            # stacks, etc.) are present, to avoid root-task overproduction. Input
+            # layers (e.g. from `from_pandas`) don't depend on anything, and
+            # don't need it
+            fuse = any(
+                dsk.dependencies.get(name) and not isinstance(layer, Blockwise)
+                for name, layer in dsk.layers.items()
+            )
+            if fuse:
+                fuse_config = {"optimization.fuse.active": True, "optimization.fuse.ave-width": 2}
+            else:
+                fuse_config = {"optimization.fuse.active": False}
+            name = ddf._name if ddf is not None else _output_layer_name(keys)
+            dsk = _optimize_graph(dsk, keys, fuse_config, name)
 
     if ddf is None:
         # Return optimized graph
@@ -221,6 +434,31 @@ def ensure_optimize_dataframe_graph(ddf=None, dsk=None, keys=None):
     return ddf
 
 
+def _output_layer_name(keys):
+    # The name of the layer holding the output keys (which are either
+    # names or `(name, index)` tuples), if they all belong to one layer
+    names = {key if isinstance(key, str) else key[0] for key in dask.core.flatten(keys)}
+    if len(names) == 1:
+        return names.pop()
+    return "optimized-" + dask.base.tokenize(sorted(names))
+
+
+def _optimize_graph(dsk, keys, fuse_config, name):
+    from dask.dataframe.optimize import optimize as dd_optimize
+
+    with dask.config.set(fuse_config):
+        optimized = dd_optimize(dsk, keys=keys)
+
+    if not isinstance(optimized, dask.highlevelgraph.HighLevelGraph):
+        # Low-level fusion returns a plain dict, so wrap it back up into
+        # a single layer named after the output, where dask expects it
+        optimized = dask.highlevelgraph.HighLevelGraph.from_collections(
+            name, optimized, dependencies=()
+        )
+
+    return optimized
+
+
 class Distributed:
     """Distributed-Execution Context Manager
 
@@ -320,6 +558,9 @@ class Distributed:
         self._allow_shutdown = global_dask_client() is None or force_new
         self._active = False
         self.force_new = force_new
+        # Safety net for instances that are never deactivated. This only
+        # holds a weak reference, so it doesn't keep the cluster alive
+        self._atexit_hook = functools.partial(_deactivate_at_exit, weakref.ref(self))
         # Activate/deploy the client/cluster
         self._activate()
 
@@ -343,6 +584,7 @@ class Distributed:
                 force_new=self.force_new,
                 **self.cluster_options,
             )
+            atexit.register(self._atexit_hook)
         self._active = True
         if self._client in ("auto", None):
             raise RuntimeError(f"Failed to deploy a new local {self.cluster_type} cluster.")
@@ -350,6 +592,7 @@ class Distributed:
     def _deactivate(self):
         self._client = set_dask_client(self._initial_client)
         self._active = False
+        atexit.unregister(self._atexit_hook)
 
     def deactivate(self):
         if self._allow_shutdown and self._active:
@@ -363,8 +606,11 @@ class Distributed:
     def __exit__(self, *args):
         self.deactivate()
 
-    def __del__(self, *args):
-        self.deactivate()
+
+def _deactivate_at_exit(ref):
+    dist = ref()
+    if dist is not None and dist._active:
+        dist.deactivate()
 
 
 class Serial:
@@ -480,13 +726,11 @@ def set_dask_client(client="auto", new_cluster=None, force_new=False, **cluster_
         `n_workers=2`).
     """
     _merlin_dask_client.set(client)
+    if client is not None:
+        _no_client_probe.set(False)
 
     # Check if we need to deploy a new cluster
     if new_cluster and client is not None:
-        base, cluster = {
-            "cuda": ("dask_cuda", "LocalCUDACluster"),
-            "cpu": ("distributed", "LocalCluster"),
-        }.get(new_cluster, (None, None))
         if global_dask_client() is not None and not force_new:
             # Don't deploy a new cluster if one already exists
             warnings.warn(
@@ -495,17 +739,9 @@ def set_dask_client(client="auto", new_cluster=None, force_new=False, **cluster_
                 f"will not be deployed. Set force_new to True "
                 f"to ignore running clusters."
             )
-        elif base and cluster:
-            try:
-                base = importlib.import_module(base)
-            except ImportError as err:
-                # ImportError should only occur for LocalCUDACluster,
-                # but I'm making this general to be "safe"
-                raise ImportError(
-                    f"new_cluster={new_cluster} requires {base}. "
-                    f"Please make sure this library is installed. "
-                ) from err
-            _merlin_dask_client.set(Client(getattr(base, cluster)(**cluster_options)))
+        elif new_cluster in _CLUSTER_CLASSES:
+            cluster_cls = _get_cluster_class(new_cluster)
+            _merlin_dask_client.set(distributed.Client(cluster_cls(**cluster_options)))
         else:
             # Something other than "cuda" or "cpu" was specified
             raise ValueError(f"{new_cluster} not a supported option for new_cluster.")
@@ -515,6 +751,21 @@ def set_dask_client(client="auto", new_cluster=None, force_new=False, **cluster_
     return None if active == "auto" else active
 
 
+@functools.lru_cache(maxsize=None)
+def _get_cluster_class(new_cluster):
+    base, cluster = _CLUSTER_CLASSES[new_cluster]
+    try:
+        module = importlib.import_module(base)
+    except ImportError as err:
+        # ImportError should only occur for LocalCUDACluster,
+        # but I'm making this general to be "safe"
+        raise ImportError(
+            f"new_cluster={new_cluster} requires {base}. "
+            f"Please make sure this library is installed. "
+        ) from err
+    return getattr(module, cluster)
+
+
 def global_dask_client() -> Optional[distributed.Client]:
     """Get Global Dask client if it's been set.
 
@@ -523,10 +774,15 @@ def global_dask_client() -> Optional[distributed.Client]:
     Optional[distributed.Client]
         The global client.
     """
+    # A previous probe found no client. That still holds
+    # unless a global Dask client has been created since
+    if _no_client_probe.get() and (_get_global_client is None or _get_global_client() is None):
+        return None
+
     # First, check _merlin_dask_client
     merlin_client = _merlin_dask_client.get()
     if merlin_client and merlin_client != "auto":
-        if merlin_client.cluster and merlin_client.cluster.workers:  # type: ignore
+        if _is_active_client(merlin_client):
             # Active Dask client already known
             return merlin_client
         else:
@@ -534,20 +790,36 @@ def global_dask_client() -> Optional[distributed.Client]:
             # active, reset to "auto"
             merlin_client = "auto"
     if merlin_client == "auto":
-        try:
-            # Check for a global Dask client
-            set_dask_client(get_client())
+        # Check for a global Dask client
+        client = _find_global_client()
+        if client is not None:
+            set_dask_client(client)
             return _merlin_dask_client.get()
-        except ValueError:
-            # no global client found
-            pass
+        # no global client found
+        _no_client_probe.set(True)
     # Catch-all
     return None
 
 
+def _find_global_client() -> Optional[distributed.Client]:
+    if _get_global_client is not None:
+        return _get_global_client()
+    try:
+        return distributed.get_client()
+    except ValueError:
+        # no global client found
+        return None
+
+
+def _is_active_client(client) -> bool:
+    # Check the (cheap) client status before touching the
+    # cluster, which can require RPCs for some cluster types
+    return client.status == "running" and bool(client.cluster and client.cluster.workers)
+
+
 def run_on_worker(func: Callable, *args, **kwargs) -> Any:
-    """Run a function on a Dask worker using `delayed`
-    execution (if a Dask client is detected)
+    """Run a function on a Dask worker using `Client.submit`
+    (if a Dask client is detected)
 
     Parameters
     ----------
@@ -560,8 +832,41 @@ def run_on_worker(func: Callable, *args, **kwargs) -> Any:
         The result of the function call with supplied arguments
     """
 
-    if global_dask_client():
-        # There is a specified or global Dask client. Use it
-        return dask.delayed(func)(*args, **kwargs).compute()
+    client = global_dask_client()
+    if client:
+        # There is a specified or global Dask client. Use it.
+        # The arguments are bound to the function up-front so
+        # they can't collide with `Client.submit` options
+        return client.submit(functools.partial(func, *args, **kwargs), pure=False).result()
     # No Dask client - Use simple function call
     return func(*args, **kwargs)
+
+
+def run_on_workers(calls: Sequence[tuple]) -> List[Any]:
+    """Run a batch of functions on Dask workers using `delayed`
+    execution (if a Dask client is detected)
+
+    All calls are submitted to the scheduler together, rather
+    than paying a scheduler round-trip for each one as repeated
+    `run_on_worker` calls would.
+
+    Parameters
+    ----------
+    calls : Sequence[tuple]
+        `(func, args)` or `(func, args, kwargs)` tuples describing
+        the function calls to run
+
+    Returns
+    -------
+    List[Any]
+        The results of the function calls, in the same order as `calls`
+    """
+    calls = [(call[0], call[1], call[2] if len(call) > 2 else {}) for call in calls]
+
+    client = global_dask_client()
+    if client:
+        # There is a specified or global Dask client. Use it
+        delayed_calls = [dask.delayed(func)(*args, **kwargs) for func, args, kwargs in calls]
+        return client.compute(delayed_calls, sync=True)
+    # No Dask client - Use simple function calls
+    return [func(*args, **kwargs) for func, args, kwargs in calls]
@@ -15,8 +15,9 @@
 #
 from __future__ import annotations
 
+import functools
 from enum import Flag, auto
-from typing import Any, List, Optional, Union
+from typing import Any, List, Optional, Tuple, Union
 
 import merlin.dag
 from merlin.core.protocols import Transformable
@@ -144,13 +145,16 @@ class BaseOperator:
             input_schema, col_selector, self.compute_output_schema.__name__
         )
 
-        output_schema = Schema()
-        for output_col_name, input_col_names in self.column_mapping(col_selector).items():
-            col_schema = ColumnSchema(output_col_name)
-            col_schema = self._compute_dtype(col_schema, input_schema[input_col_names])
-            col_schema = self._compute_tags(col_schema, input_schema[input_col_names])
-            col_schema = self._compute_properties(col_schema, input_schema[input_col_names])
-            output_schema += Schema([col_schema])
+        compute_column_schema = self._column_schema_computer()
+
+        # Output column names are unique (they're the keys of the column mapping),
+        # so the output schema can be built in one go rather than merged column by column
+        output_schema = Schema(
+            [
+                compute_column_schema(output_col_name, input_schema[input_col_names])
+                for output_col_name, input_col_names in self.column_mapping(col_selector).items()
+            ]
+        )
 
         if self.dynamic_dtypes and prev_output_schema:
             for col_name, col_schema in output_schema.column_schemas.items():
@@ -206,6 +210,23 @@ class BaseOperator:
         """
         return transformable
 
+    def as_predicate(self) -> Optional[Tuple[str, str, Any]]:
+        """Describe this operator as a simple row filter, if it is one
+
+        Operators that only keep the rows where a single column compares to a
+        constant (e.g. ``("price", ">", 0)``) can return that comparison here,
+        so executors can apply it as a vectorized boolean mask instead of
+        calling `transform`. Such operators should also set `is_row_filter`.
+
+        Returns
+        -------
+        Optional[Tuple[str, str, Any]]
+            A tuple of (column name, comparison operator, value), where the comparison
+            is one of "==", "!=", "<", "<=", ">" or ">=". Defaults to None, meaning that
+            `transform` is always used
+        """
+        return None
+
     def column_mapping(self, col_selector):
         """
         Compute which output columns depend on which input columns
@@ -220,10 +241,7 @@ class BaseOperator:
         Dict[str, List[str]]
             Mapping from output column names to list of the input columns they rely on
         """
-        column_mapping = {}
-        for col_name in col_selector.names:
-            column_mapping[col_name] = [col_name]
-        return column_mapping
+        return {col_name: [col_name] for col_name in col_selector.names}
 
     def compute_column_schema(self, col_name, input_schema):
         methods = [self._compute_dtype, self._compute_tags, self._compute_properties]
@@ -237,6 +255,64 @@ class BaseOperator:
 
         return col_schema
 
+    def _column_schema_computer(self):
+        # Operators that don't customize how column schemas are computed get a fused
+        # version of `_compute_dtype`, `_compute_tags` and `_compute_properties`
+        if _uses_default_column_schema_methods(type(self)):
+            # Resolve the operator's output metadata once for all columns. This
+            # can't be cached across calls, since it may depend on fitted state
+            return functools.partial(
+                self._compute_default_column_schema,
+                output_meta=(self.output_dtype, self.output_tags, self.output_properties),
+            )
+
+        methods = [self._compute_dtype, self._compute_tags, self._compute_properties]
+
+        def compute_column_schema(col_name, input_schema):
+            col_schema = ColumnSchema(col_name)
+            for method in methods:
+                col_schema = method(col_schema, input_schema)
+            return col_schema
+
+        return compute_column_schema
+
+    def _compute_default_column_schema(self, col_name, input_schema, output_meta=None):
+        # Equivalent to applying `_compute_dtype`, `_compute_tags` and
+        # `_compute_properties` in turn, but only looks up the source column once
+        if output_meta is None:
+            output_meta = (self.output_dtype, self.output_tags, self.output_properties)
+        output_dtype, output_tags, output_properties = output_meta
+
+        col_schema = ColumnSchema(col_name)
+        dtype = col_schema.dtype
+        is_list = col_schema.is_list
+        is_ragged = col_schema.is_ragged
+        tags = []
+        properties = {}
+
+        column_schemas = input_schema.column_schemas
+        if column_schemas:
+            source_col_schema = next(iter(column_schemas.values()))
+            dtype = source_col_schema.dtype
+            is_list = source_col_schema.is_list
+            is_ragged = source_col_schema.is_ragged
+            tags = source_col_schema.tags
+            properties.update(source_col_schema.properties)
+
+        if output_dtype is not None:
+            dtype = output_dtype
+            is_list = any(cs.is_list for cs in column_schemas.values())
+            is_ragged = any(cs.is_ragged for cs in column_schemas.values())
+
+        properties.update(output_properties)
+
+        return (
+            col_schema.with_dtype(dtype, is_list=is_list, is_ragged=is_ragged)
+            .with_tags(tags)
+            .with_tags(output_tags)
+            .with_properties(properties)
+        )
+
     def _compute_dtype(self, col_schema, input_schema):
         dtype = col_schema.dtype
         is_list = col_schema.is_list
@@ -281,10 +357,15 @@ class BaseOperator:
         return col_schema.with_properties(properties)
 
     def _validate_matching_cols(self, schema, selector, method_name):
-        selector = selector or ColumnSelector()
-        resolved_selector = selector.resolve(schema)
-
-        missing_cols = [name for name in selector.names if name not in resolved_selector.names]
+        # Wildcard and empty selectors can't refer to missing columns
+        if not selector or selector.all:
+            return
+
+        # Resolving the selector against the schema keeps exactly the selected names
+        # that are in the schema, so the missing ones can be found with direct lookups
+        # in the schema's columns rather than by resolving the selector (tags included)
+        column_schemas = schema.column_schemas
+        missing_cols = [name for name in selector.names if name not in column_schemas]
         if missing_cols:
             raise ValueError(
                 f"Missing columns {missing_cols} found in operator"
@@ -344,13 +425,25 @@ class BaseOperator:
     def create_node(self, selector):
         return merlin.dag.Node(selector)
 
-    @property
-    def supports(self) -> Supports:
-        """Returns what kind of data representation this operator supports"""
-        return Supports.CPU_DATAFRAME | Supports.GPU_DATAFRAME
+    # What kind of data representation this operator supports. This is a class attribute
+    # rather than a property so checking it doesn't recompute the flags on every access
+    # (sub-classes can still override it with either)
+    supports: Supports = Supports.CPU_DATAFRAME | Supports.GPU_DATAFRAME
+
+    # Whether this operator drops rows (rather than only transforming columns), which
+    # can leave its output split into many small partitions
+    is_row_filter: bool = False
 
     def _get_columns(self, df, selector):
         if isinstance(df, dict):
             return {col_name: df[col_name] for col_name in selector.names}
         else:
             return df[selector.names]
+
+
+@functools.lru_cache(maxsize=None)
+def _uses_default_column_schema_methods(op_class) -> bool:
+    return all(
+        getattr(op_class, method_name) is getattr(BaseOperator, method_name)
+        for method_name in ("_compute_dtype", "_compute_tags", "_compute_properties")
+    )
@@ -13,20 +13,26 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
 import logging
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import dask
+import dask.dataframe as dd
 import pandas as pd
 from dask.core import flatten
 
 import merlin.dtypes as md
-from merlin.core.dispatch import concat_columns, is_list_dtype, list_val_dtype
+from merlin.core.dispatch import concat_columns, is_dataframe_object, is_list_dtype, list_val_dtype
 from merlin.core.utils import (
     ensure_optimize_dataframe_graph,
     global_dask_client,
     set_client_deprecated,
 )
 from merlin.dag import ColumnSelector, Graph, Node
+from merlin.dag.node import iter_nodes
 from merlin.io.worker import clean_worker_cache
 
 LOG = logging.getLogger("merlin")
@@ -35,8 +41,23 @@ LOG = logging.getLogger("merlin")
 class LocalExecutor:
     """
     An executor for running Merlin operator DAGs locally
+
+    Parameters
+    ----------
+    max_workers : int, optional
+        When greater than one, sibling parents of a node are executed concurrently
+        on a pool of this many threads, which helps when their operators release
+        the GIL (numpy, cudf). By default None, running the graph sequentially
     """
 
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers
+
+    def __getstate__(self):
+        # thread pools and thread-locals aren't picklable - exclude from saved representation
+        excluded = ("_pool", "_local")
+        return {k: v for k, v in self.__dict__.items() if k not in excluded}
+
     def transform(
         self,
         transformable,
@@ -64,28 +85,134 @@ class LocalExecutor:
                 " compatibility.)"
             )
 
-        output_data = None
+        # Outputs of the nodes executed so far in this call, so that nodes
+        # shared by several downstream branches of the graph only run once
+        cache = {}
 
+        # Collect the outputs of all the nodes and concatenate them once at the end
+        frames = []
         for node in nodes:
-            input_data = self._build_input_data(node, transformable, capture_dtypes=capture_dtypes)
+            transformed_data = self._transform_cached(
+                node, transformable, cache, capture_dtypes=capture_dtypes
+            )
+            frames.append(self._select_node_outputs(node, transformed_data))
 
-            if node.op:
-                transformed_data = self._transform_data(
-                    node, input_data, capture_dtypes=capture_dtypes
-                )
-            else:
-                transformed_data = input_data
+        if additional_columns:
+            frames.append(transformable[_get_unique(additional_columns)])
 
-            output_data = self._combine_node_outputs(node, transformed_data, output_data)
+        return concat_columns(frames) if frames else None
 
-        if additional_columns:
-            output_data = concat_columns(
-                [output_data, transformable[_get_unique(additional_columns)]]
-            )
+    def _transform_cached(self, node, transformable, cache, capture_dtypes=False):
+        """
+        Execute a node (and its ancestors), reusing previously computed outputs
+        Parameters
+        ----------
+        node : Node
+            Node of the graph to execute
+        transformable : Transformable
+            Dataframe to run the graph ending with node on
+        cache : dict
+            Transformed outputs of already executed nodes, keyed by node id
+        capture_dtypes : bool, optional
+            Overrides the schema dtypes with the actual dtypes when True, by default False
+        Returns
+        -------
+        Transformable
+            The output DataFrame or DictArray of the node
+        """
+        key = id(node)
+        if key in cache:
+            return cache[key]
+
+        if self._get_pool() is not None:
+            # Siblings running on the pool may share ancestors, so serialize
+            # execution per node to keep running each node only once
+            # (dict.setdefault is atomic, so every thread gets the same lock)
+            with cache.setdefault((key, "lock"), threading.Lock()):
+                if key not in cache:
+                    self._transform_uncached(node, transformable, cache, capture_dtypes)
+            return cache[key]
+
+        return self._transform_uncached(node, transformable, cache, capture_dtypes)
+
+    def _transform_uncached(self, node, transformable, cache, capture_dtypes):
+        key = id(node)
+        input_data = self._build_input_data(
+            node, transformable, cache=cache, capture_dtypes=capture_dtypes
+        )
 
-        return output_data
+        if node.op:
+            transformed_data = self._transform_data(node, input_data, capture_dtypes=capture_dtypes)
+        else:
+            transformed_data = input_data
+
+        cache[key] = transformed_data
+        return transformed_data
 
-    def _build_input_data(self, node, transformable, capture_dtypes=False):
+    def _transform_parents(self, parents, transformable, cache, capture_dtypes=False):
+        """
+        Execute the parents of a node, concurrently if a thread pool is configured
+        Parameters
+        ----------
+        parents : List[Node]
+            Parent nodes to execute
+        transformable : Transformable
+            Dataframe to run the graph ending with each parent on
+        cache : dict
+            Transformed outputs of already executed nodes, keyed by node id
+        capture_dtypes : bool, optional
+            Overrides the schema dtypes with the actual dtypes when True, by default False
+        Returns
+        -------
+        List[Transformable]
+            The output of each parent, in the same order as `parents`
+        """
+        # Only fan out from the calling thread: parents that are themselves
+        # running on the pool execute their ancestors sequentially, so nested
+        # submissions can't exhaust the pool and deadlock
+        pool = self._get_pool() if len(parents) > 1 else None
+        if pool is not None and getattr(self._local, "in_pool", False):
+            pool = None
+
+        if pool is None:
+            return [
+                self._transform_cached(parent, transformable, cache, capture_dtypes=capture_dtypes)
+                for parent in parents
+            ]
+
+        futures = [
+            pool.submit(self._transform_in_pool, parent, transformable, cache, capture_dtypes)
+            for parent in parents
+        ]
+        return [future.result() for future in futures]
+
+    def _transform_in_pool(self, node, transformable, cache, capture_dtypes):
+        self._local.in_pool = True
+        try:
+            return self._transform_cached(node, transformable, cache, capture_dtypes=capture_dtypes)
+        finally:
+            self._local.in_pool = False
+
+    def _get_pool(self):
+        # The pool (and the thread-local state that goes with it) is created on first
+        # use, so executors that were unpickled or whose subclass doesn't call
+        # `LocalExecutor.__init__` don't need any of it set up in advance
+        max_workers = getattr(self, "max_workers", None)
+        if not max_workers or max_workers <= 1:
+            return None
+
+        pool = getattr(self, "_pool", None)
+        if pool is None:
+            with _POOL_CREATION_LOCK:
+                pool = getattr(self, "_pool", None)
+                if pool is None:
+                    self._local = threading.local()
+                    pool = self._pool = ThreadPoolExecutor(
+                        max_workers=max_workers, thread_name_prefix="merlin-executor"
+                    )
+        return pool
+
+    def _build_input_data(self, node, transformable, cache=None, capture_dtypes=False):
         """
         Recurse through the graph executing parent and dependency operators
         to form the input dataframe for each output node
@@ -95,6 +222,8 @@ class LocalExecutor:
             Output node of the graph to execute
         transformable : Transformable
             Dataframe to run the graph ending with node on
+        cache : dict, optional
+            Transformed outputs of already executed nodes, keyed by node id
         capture_dtypes : bool, optional
             Overrides the schema dtypes with the actual dtypes when True, by default False
         Returns
@@ -103,41 +232,58 @@ class LocalExecutor:
             The input DataFrame or DictArray formed from
             the outputs of upstream parent/dependency nodes
         """
-        node_input_cols = _get_unique(node.input_schema.column_names)
-        addl_input_cols = set(node.dependency_columns.names)
+        if cache is None:
+            cache = {}
+
+        # Schema column names are unique by construction (they're dict keys),
+        # so they don't need to be de-duplicated here or below
+        node_input_cols = node.input_schema.column_names
+        dependency_cols = node.dependency_columns.names
 
         if node.parents_with_dependencies:
             # If there are parents, collect their outputs
             # to build the current node's input
-            input_data = None
-            seen_columns = None
-
-            for parent in node.parents_with_dependencies:
-                parent_output_cols = _get_unique(parent.output_schema.column_names)
-                parent_data = self.transform(transformable, [parent], capture_dtypes=capture_dtypes)
-                if input_data is None or not len(input_data):
-                    input_data = parent_data[parent_output_cols]
-                    seen_columns = set(parent_output_cols)
-                else:
-                    new_columns = set(parent_output_cols) - seen_columns
-                    input_data = concat_columns([input_data, parent_data[list(new_columns)]])
-                    seen_columns.update(new_columns)
+            parents = node.parents_with_dependencies
+
+            # Work out up-front which parent supplies each column (the first
+            # parent to produce a column wins), so that each parent's output
+            # is projected once, down to just the columns it contributes
+            parent_columns = []
+            seen_columns = set()
+            for parent in parents:
+                new_columns = [
+                    col for col in parent.output_schema.column_names if col not in seen_columns
+                ]
+                parent_columns.append(new_columns)
+                seen_columns.update(new_columns)
+
+            # Collect the pieces of the input and concatenate them all at once,
+            # rather than re-copying the accumulated columns for every parent
+            frames = []
+            parents_data = self._transform_parents(
+                parents, transformable, cache, capture_dtypes=capture_dtypes
+            )
+            for parent_data, new_columns in zip(parents_data, parent_columns):
+                if new_columns or not frames:
+                    frames.append(parent_data[new_columns])
 
             # Check for additional input columns that aren't generated by parents
-            # and fetch them from the root DataFrame or DictArray
-            unseen_columns = set(node.input_schema.column_names) - seen_columns
-            addl_input_cols = addl_input_cols.union(unseen_columns)
-
-            # TODO: Find a better way to remove dupes
-            addl_input_cols = addl_input_cols - set(input_data.columns)
+            # and fetch them from the root DataFrame or DictArray in one projection
+            # (`seen_columns` is the only set needed to track what's been covered)
+            addl_input_cols = []
+            for col in node_input_cols + dependency_cols:
+                if col not in seen_columns:
+                    seen_columns.add(col)
+                    addl_input_cols.append(col)
 
             if addl_input_cols:
-                input_data = concat_columns([input_data, transformable[list(addl_input_cols)]])
+                frames.append(transformable[addl_input_cols])
+
+            input_data = concat_columns(frames)
         else:
             # If there are no parents, this is an input node,
             # so pull columns directly from root data
-            addl_input_cols = list(addl_input_cols) if addl_input_cols else []
-            input_data = transformable[node_input_cols + addl_input_cols]
+            input_data = transformable[node_input_cols + dependency_cols]
 
         return input_data
 
@@ -168,22 +314,37 @@ class LocalExecutor:
         try:
             # use input_columns to ensure correct grouping (subgroups)
             selection = node.input_columns.resolve(node.input_schema)
-            output_data = node.op.transform(selection, input_data)
+            predicate = node.op.as_predicate()
+            if predicate is not None and is_dataframe_object(input_data):
+                output_data = _apply_predicate(input_data, predicate)
+            else:
+                output_data = node.op.transform(selection, input_data)
+
+            # Fetch the dtypes of all dataframe columns at once, so that
+            # columns which can't contain lists don't need to be fetched
+            # and inspected individually
+            output_dtypes = (
+                dict(output_data.dtypes.items()) if is_dataframe_object(output_data) else {}
+            )
 
             # Update or validate output_data dtypes
             for col_name, output_col_schema in node.output_schema.column_schemas.items():
-                col_series = output_data[col_name]
-                col_dtype = col_series.dtype
-                is_list = is_list_dtype(col_series)
+                col_dtype = output_dtypes.get(col_name)
+                if col_dtype is not None and not _may_contain_lists(col_dtype):
+                    is_list = False
+                else:
+                    col_series = output_data[col_name]
+                    col_dtype = col_series.dtype
+                    is_list = is_list_dtype(col_series)
 
-                if is_list:
-                    col_dtype = list_val_dtype(col_series)
+                    if is_list:
+                        col_dtype = list_val_dtype(col_series)
 
-                # TODO: Add a utility that condenses the known methods of fetching dtypes
-                # from series/arrays into a single function, so that Tensorflow specific
-                # code doesn't leak into the executors
-                if not hasattr(col_dtype, "as_numpy_dtype") and hasattr(col_series, "numpy"):
-                    col_dtype = col_series[0].cpu().numpy().dtype
+                    # TODO: Add a utility that condenses the known methods of fetching dtypes
+                    # from series/arrays into a single function, so that Tensorflow specific
+                    # code doesn't leak into the executors
+                    if _is_tensor_without_numpy_dtype(type(col_series), type(col_dtype)):
+                        col_dtype = col_series[0].cpu().numpy().dtype
 
                 output_data_schema = output_col_schema.with_dtype(col_dtype, is_list=is_list)
 
@@ -214,27 +375,31 @@ class LocalExecutor:
 
         return output_data
 
-    def _combine_node_outputs(self, node, transformed_data, output):
-        node_output_cols = _get_unique(node.output_schema.column_names)
-
+    def _select_node_outputs(self, node, transformed_data):
         # dask needs output to be in the same order defined as meta, reorder partitions here
         # this also selects columns (handling the case of removing columns from the output using
         # "-" overload)
-        if output is None:
-            output = transformed_data[node_output_cols]
-        else:
-            output = concat_columns([output, transformed_data[node_output_cols]])
-
-        return output
+        return transformed_data[node.output_schema.column_names]
 
 
 class DaskExecutor:
     """
     An executor for running Merlin operator DAGs as distributed Dask jobs
+
+    Parameters
+    ----------
+    client : distributed.Client, optional
+        Deprecated, use `merlin.core.utils.set_dask_client` instead
+    filter_coalesce_factor : int, optional
+        When greater than one, the output of graphs containing row-filtering
+        operators (see `BaseOperator.is_row_filter`) is coalesced into this
+        many times fewer partitions, so that downstream work doesn't pay the
+        per-partition overhead for mostly empty partitions. By default None
     """
 
-    def __init__(self, client=None):
+    def __init__(self, client=None, filter_coalesce_factor=None):
         self._executor = LocalExecutor()
+        self.filter_coalesce_factor = filter_coalesce_factor
 
         # Deprecate `client`
         if client is not None:
@@ -250,7 +415,18 @@ class DaskExecutor:
         """
         Transforms all partitions of a Dask Dataframe by applying the operators
         from a collection of Nodes
+
+        A DataFrame or DictArray that's already in memory (rather than a Dask
+        collection) is transformed directly, without building a Dask graph
         """
+        if not isinstance(ddf, dd.DataFrame):
+            return self._executor.transform(
+                ddf,
+                graph,
+                additional_columns=additional_columns,
+                capture_dtypes=capture_dtypes,
+            )
+
         nodes = []
         if isinstance(graph, Graph):
             nodes.append(graph.output_node)
@@ -281,6 +457,13 @@ class DaskExecutor:
         columns = list(flatten(wfn.output_columns.names for wfn in nodes))
         columns += additional_columns if additional_columns else []
 
+        # Drop root columns that no node in the graph reads before mapping over
+        # the partitions, so the projection can be pushed down into the IO layer
+        # (e.g. `read_parquet`) and unused columns are never read at all
+        root_columns = _root_columns(nodes, ddf.columns, additional_columns)
+        if root_columns is not None and len(root_columns) < len(ddf.columns):
+            ddf = ddf[root_columns]
+
         if isinstance(output_dtypes, dict):
             for col_name, col_dtype in output_dtypes.items():
                 if col_dtype:
@@ -300,10 +483,19 @@ class DaskExecutor:
             # don't require dtype information on the DDF this doesn't matter all that much
             output_dtypes = type(ddf._meta)({k: [] for k in columns})
 
-        return ensure_optimize_dataframe_graph(
+        dask_client = global_dask_client()
+        if dask_client:
+            # Send the graph to every worker once, rather than with every
+            # partition task. The tasks only reference the scattered data, which
+            # the workers release along with the futures of this transform
+            (graph_nodes,) = dask_client.scatter([nodes], broadcast=True, hash=False)
+        else:
+            graph_nodes = nodes
+
+        transformed_ddf = ensure_optimize_dataframe_graph(
             ddf=ddf.map_partitions(
                 self._executor.transform,
-                nodes,
+                graph_nodes,
                 additional_columns=additional_columns,
                 capture_dtypes=capture_dtypes,
                 meta=output_dtypes,
@@ -311,6 +503,17 @@ class DaskExecutor:
             )
         )
 
+        coalesce_factor = getattr(self, "filter_coalesce_factor", None)
+        if coalesce_factor and coalesce_factor > 1 and transformed_ddf.npartitions > 1:
+            if any(getattr(node.op, "is_row_filter", False) for node in iter_nodes(list(nodes))):
+                # Merging neighbouring partitions stays lazy, unlike repartitioning
+                # by size, which would have to compute the partitions up front
+                transformed_ddf = transformed_ddf.repartition(
+                    npartitions=max(1, transformed_ddf.npartitions // coalesce_factor)
+                )
+
+        return transformed_ddf
+
     def fit(self, ddf, nodes):
         """Calculates statistics for a set of nodes on the input dataframe
 
@@ -364,6 +567,58 @@ class DaskExecutor:
             clean_worker_cache()
 
 
+@functools.lru_cache(maxsize=None)
+def _is_tensor_without_numpy_dtype(series_type, dtype_type):
+    # Whether the dtype has to be read from the tensor's values (e.g. torch tensors),
+    # rather than directly from a dtype that converts to numpy (e.g. Tensorflow).
+    # This only depends on the types involved, so it's classified once per type pair
+    return not hasattr(dtype_type, "as_numpy_dtype") and hasattr(series_type, "numpy")
+
+
+# Guards the lazy creation of each `LocalExecutor`'s thread pool. That only
+# happens once per executor, so a single lock for all of them is enough
+_POOL_CREATION_LOCK = threading.Lock()
+
+_PREDICATE_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _apply_predicate(df, predicate):
+    # Filter the rows with a boolean mask, which is vectorized by both pandas and cudf
+    col_name, comparison, value = predicate
+    try:
+        compare = _PREDICATE_COMPARISONS[comparison]
+    except KeyError as exc:
+        raise ValueError(
+            f"Unsupported predicate comparison `{comparison}`, "
+            f"expected one of {list(_PREDICATE_COMPARISONS)}"
+        ) from exc
+    return df[compare(df[col_name], value)]
+
+
+def _may_contain_lists(dtype):
+    # List columns are either object-typed (pandas) or have a list dtype (cudf)
+    return getattr(dtype, "kind", None) == "O" or is_list_dtype(dtype)
+
+
+def _root_columns(nodes, available_columns, additional_columns=None):
+    # Columns of the root data referenced anywhere in the graph, in their original
+    # order. Returns None when that can't be determined (nodes without schemas)
+    referenced = set(additional_columns or [])
+    for node in iter_nodes(list(nodes)):
+        if node.input_schema is None:
+            return None
+        referenced.update(node.input_schema.column_names)
+        referenced.update(node.dependency_columns.names)
+    return [col for col in available_columns if col in referenced]
+
+
 def _get_unique(cols):
     # Need to preserve order in unique-column list
-    return list({x: x for x in cols}.keys())
+    return list(dict.fromkeys(cols))
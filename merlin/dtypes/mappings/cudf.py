@@ -13,14 +13,46 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
+import weakref
+from typing import Dict, Tuple
+
 import numpy as np
 
 from merlin.core.dispatch import is_string_dtype
 from merlin.dtypes.mapping import DTypeMapping, NumpyPreprocessor
 from merlin.dtypes.registry import _dtype_registry
 
+# Translations of categorical dtypes, keyed by the id of the dtype object. Many
+# columns of a wide dataframe can share a dtype object, so each one is only
+# translated once. Entries hold a weak reference to their dtype, so they don't
+# keep it alive and are dropped when it's garbage collected
+_translated_dtypes: Dict[int, Tuple[weakref.ref, np.dtype]] = {}
+
 
 def cudf_translator(raw_dtype) -> np.dtype:
+    key = id(raw_dtype)
+    cached = _translated_dtypes.get(key)
+    if cached is not None and cached[0]() is raw_dtype:
+        return cached[1]
+
+    translated = _translate_categorical(raw_dtype)
+
+    try:
+        ref = weakref.ref(raw_dtype, functools.partial(_evict_translated_dtype, key))
+    except TypeError:
+        # Not weak-referenceable, so can't be cached safely by id
+        return translated
+
+    _translated_dtypes[key] = (ref, translated)
+    return translated
+
+
+def _evict_translated_dtype(key: int, _ref: weakref.ref) -> None:
+    _translated_dtypes.pop(key, None)
+
+
+def _translate_categorical(raw_dtype) -> np.dtype:
     category_type = raw_dtype._categories.dtype
     if is_string_dtype(category_type):
         return np.dtype("str")
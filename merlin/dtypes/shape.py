@@ -14,83 +14,314 @@
 # limitations under the License.
 #
 
-from dataclasses import dataclass
+from dataclasses import FrozenInstanceError
+from operator import attrgetter
 from typing import Optional, Tuple, Union
 
+import numpy as np
+
 
-@dataclass(frozen=True)
 class Dimension:
     """
     The range of potential sizes for a single dimension of a field or column
     """
 
-    min: int = 0
-    max: Optional[int] = None
+    # A small immutable class with slots (rather than a frozen dataclass) keeps
+    # instances free of a `__dict__`, since a `Shape` holds one per dimension.
+    # The flags and hash are computed once, so shapes can aggregate and compare them cheaply
+    __slots__ = ("min", "max", "_is_bounded", "_is_fixed", "_hash")
+
+    min: int
+    max: Optional[int]
+    _is_bounded: bool
+    _is_fixed: bool
+    _hash: int
 
-    def __post_init__(self):
-        if self.min is None:
+    # pylint: disable=redefined-builtin
+    def __init__(self, min: int = 0, max: Optional[int] = None):
+        object.__setattr__(self, "min", min)
+        object.__setattr__(self, "max", max)
+
+        if min is None:
             raise ValueError("The minimum size of a dimension cannot be None. ")
 
-        if self.min < 0:
+        if min < 0:
             raise ValueError(
-                "The minimum size of a dimension must be non-negative. " f"Provided min: {self.min}"
+                "The minimum size of a dimension must be non-negative. " f"Provided min: {min}"
             )
 
-        if self.max and self.max < 0:
-            raise ValueError(
-                "The maximum size of a dimension must be at least one. " f"Provided max: {self.max}"
-            )
+        # A max of zero is a valid bound, so this checks for None explicitly
+        # (rather than truthiness) to validate it against the min as well
+        if max is not None:
+            if max < 0:
+                raise ValueError(
+                    "The maximum size of a dimension must be non-negative. " f"Provided max: {max}"
+                )
 
-        if self.max and self.max < self.min:
-            raise ValueError(
-                "The maximum size of a dimension must be at least as large as the minimum size. "
-                f"Provided min: {self.min} max: {self.max}"
-            )
+            if max < min:
+                raise ValueError(
+                    "The maximum size of a dimension must be at least as large as the minimum "
+                    f"size. Provided min: {min} max: {max}"
+                )
+
+        self._compute_derived()
+
+    @classmethod
+    def _new_unchecked(cls, min: int, max: Optional[int]) -> "Dimension":
+        """Create a dimension from bounds that are already known to be valid"""
+        dim = object.__new__(cls)
+        object.__setattr__(dim, "min", min)
+        object.__setattr__(dim, "max", max)
+        dim._compute_derived()
+        return dim
+
+    def _compute_derived(self):
+        is_bounded = self.max is not None
+        object.__setattr__(self, "_is_bounded", is_bounded)
+        object.__setattr__(self, "_is_fixed", is_bounded and self.min == self.max)
+        object.__setattr__(self, "_hash", hash((self.min, self.max)))
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        # Equal dimensions have equal hashes, so differing ones rule out equality
+        if self._hash != other._hash:
+            return False
+        return self.min == other.min and self.max == other.max
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(min={self.min!r}, max={self.max!r})"
+
+    def __reduce__(self):
+        return (self._new_unchecked, (self.min, self.max))
+
+    def __setstate__(self, state):
+        # Pickles made when `Dimension` was a dataclass restore
+        # its fields from a dict, so these are still loadable
+        object.__setattr__(self, "min", state["min"])
+        object.__setattr__(self, "max", state["max"])
+        self._compute_derived()
 
     @property
     def is_bounded(self):
-        return self.max is not None
+        return self._is_bounded
 
     @property
     def is_fixed(self):
-        return self.is_bounded and self.min == self.max
+        return self._is_fixed
 
     @property
     def is_variable(self):
-        return not self.is_fixed
+        return not self._is_fixed
+
+
+_get_min = attrgetter("min")
+_get_max = attrgetter("max")
+_get_is_bounded = attrgetter("_is_bounded")
+_get_is_fixed = attrgetter("_is_fixed")
+
+# Dimensions are immutable, so the same few that make up most shapes (unknown,
+# scalar, fixed-size lists) can be shared between shapes instead of being
+# re-created for each one. The cache is capped, so diverse shapes can't grow it
+# without bound
+_DIMENSION_CACHE_SIZE = 1024
+_DIMENSION_CACHE = {
+    bounds: Dimension._new_unchecked(*bounds) for bounds in [(0, None), (0, 0), (1, 1)]
+}
+
+
+# pylint: disable=redefined-builtin
+def _dimension(min: int, max: Optional[int]) -> Dimension:
+    # Only plain ints are cached, so that e.g. `True` or `1.0` don't get
+    # mixed up with the equal (and equally hashed) `1`. That takes an exact
+    # type check, since `bool` is a subclass of `int`
+    # pylint: disable-next=unidiomatic-typecheck
+    if type(min) is not int or (max is not None and type(max) is not int):
+        return Dimension(min, max)
+
+    key = (min, max)
+    dim = _DIMENSION_CACHE.get(key)
+    if dim is None:
+        dim = Dimension(min, max)
+        if len(_DIMENSION_CACHE) < _DIMENSION_CACHE_SIZE:
+            _DIMENSION_CACHE[key] = dim
+    return dim
+
+
+def _cached_dimension(min: int, max: Optional[int]) -> Dimension:
+    # Like `_dimension`, but for plain int bounds that are already known to be valid
+    key = (min, max)
+    dim = _DIMENSION_CACHE.get(key)
+    if dim is None:
+        dim = Dimension._new_unchecked(min, max)
+        if len(_DIMENSION_CACHE) < _DIMENSION_CACHE_SIZE:
+            _DIMENSION_CACHE[key] = dim
+    return dim
+
+
+# Converters from the accepted formats of a single dimension in a shape tuple
+# to a `Dimension`, which return None for values they can't convert
+_DIMENSION_CONVERTERS = {
+    Dimension: lambda dim: dim,
+    tuple: lambda dim: _dimension(dim[0], dim[1]) if len(dim) == 2 else None,
+    int: lambda dim: _dimension(dim, dim),
+    type(None): lambda dim: _dimension(0, None),
+}
+
+
+def _convert_dimension_subclass(dim) -> Optional[Dimension]:
+    for dim_type, convert in _DIMENSION_CONVERTERS.items():
+        if isinstance(dim, dim_type):
+            return convert(dim)
+    return None
 
 
-@dataclass(frozen=True)
 class Shape:
     """
     The range of potential sizes for all the dimensions of a field or column
     """
 
-    dims: Optional[Union[Tuple, "Shape"]] = None
+    # Shapes are immutable, so everything derived from the dimensions
+    # is computed once on construction rather than on every access
+    __slots__ = (
+        "dims",
+        "_min",
+        "_max",
+        "_is_bounded",
+        "_is_fixed",
+        "_is_ragged",
+        "_as_tuple",
+        "_hash",
+    )
 
-    def __post_init__(self):
-        if isinstance(self.dims, Shape):
-            object.__setattr__(self, "dims", self.dims.dims)
+    dims: Optional[Tuple[Dimension, ...]]
+    _min: Optional[Tuple]
+    _max: Optional[Tuple]
+    _is_bounded: bool
+    _is_fixed: bool
+    _is_ragged: bool
+    _as_tuple: Optional[Tuple]
+    _hash: int
 
-        if self.dims is not None:
+    def __init__(self, dims: Optional[Union[Tuple, "Shape"]] = None):
+        if isinstance(dims, Shape):
+            # Shapes are immutable, so the dimensions and everything
+            # derived from them can be reused as they are
+            for name in Shape.__slots__:
+                object.__setattr__(self, name, getattr(dims, name))
+            return
+
+        # Dimensions that are all `Dimension` objects already (the common case
+        # for internally created shapes) don't need normalizing. Other sequences
+        # (including tuple subclasses) are still converted to a plain tuple
+        # pylint: disable-next=unidiomatic-typecheck
+        if type(dims) is tuple and all(isinstance(dim, Dimension) for dim in dims):
+            pass
+        elif dims is not None:
+            # Look up how to convert each element by its exact type, falling
+            # back to `isinstance` checks for subclasses (e.g. named tuples)
+            get_converter = _DIMENSION_CONVERTERS.get
             new_dims = []
-            for i, dim in enumerate(self.dims):
-                if isinstance(dim, Dimension):
-                    new_dim = dim
-                elif isinstance(dim, tuple) and len(dim) == 2:
-                    new_dim = Dimension(dim[0], dim[1])
-                elif isinstance(dim, int):
-                    new_dim = Dimension(dim, dim)
-                elif dim is None:
-                    new_dim = Dimension()
-                else:
+            for dim in dims:
+                new_dim = get_converter(type(dim), _convert_dimension_subclass)(dim)
+                if new_dim is None:
                     raise ValueError(
-                        f"Invalid shape tuple format: {self.dims}. Each dimension is expected "
+                        f"Invalid shape tuple format: {dims}. Each dimension is expected "
                         " to be None, a single integer, or a tuple with length 2."
                     )
                 new_dims.append(new_dim)
 
-            object.__setattr__(self, "dims", tuple(new_dims))
+            dims = tuple(new_dims)
+
+        object.__setattr__(self, "dims", dims)
+        self._compute_derived()
+
+    @classmethod
+    def _new_unchecked(cls, dims: Optional[Tuple[Dimension, ...]]) -> "Shape":
+        """Create a shape from a tuple of `Dimension` objects without normalizing it"""
+        shape = object.__new__(cls)
+        object.__setattr__(shape, "dims", dims)
+        shape._compute_derived()
+        return shape
+
+    @classmethod
+    def from_arrays(cls, mins, maxs) -> "Shape":
+        """Create a shape from arrays of the minimum and maximum size of each dimension
+
+        Parameters
+        ----------
+        mins : array-like of int
+            The minimum size of each dimension
+        maxs : array-like of int
+            The maximum size of each dimension, where -1 marks an unbounded dimension
+
+        Returns
+        -------
+        Shape
+            A shape with one dimension per element of the arrays
+
+        Raises
+        ------
+        ValueError
+            If the arrays don't have the same length, or the bounds of a dimension are invalid
+        """
+        mins, maxs = np.asarray(mins, dtype=np.int64), np.asarray(maxs, dtype=np.int64)
+        if mins.ndim != 1 or mins.shape != maxs.shape:
+            raise ValueError(
+                "The minimum and maximum sizes must be one-dimensional arrays of the same "
+                f"length. Provided shapes: {mins.shape} and {maxs.shape}"
+            )
+
+        # The bounds are checked while building the dimensions, in the
+        # same pass, rather than re-validated by each `Dimension`
+        dims = []
+        for mn, mx in zip(mins.tolist(), maxs.tolist()):
+            if mn < 0 or mx < -1 or 0 <= mx < mn:
+                # Let `Dimension` raise the same error it would for these bounds
+                Dimension(mn, mx)
+            dims.append(_cached_dimension(mn, mx if mx >= 0 else None))
+        return cls._new_unchecked(tuple(dims))
+
+    def _compute_derived(self):
+        dims = self.dims
+        if dims is None:
+            # The dimensions are unknown, so nothing can be said about their sizes
+            mins = maxs = as_tuple = None
+            is_bounded = is_fixed = is_ragged = False
+        else:
+            # `map` with an attrgetter avoids running a Python-level
+            # generator for each dimension (and keeps `all` early-exiting)
+            mins = tuple(map(_get_min, dims))
+            maxs = tuple(map(_get_max, dims))
+            is_bounded = all(map(_get_is_bounded, dims))
+            is_fixed = all(map(_get_is_fixed, dims))
+            is_ragged = len(dims) > 1 and any(dim.min != dim.max for dim in dims[1:])
+            as_tuple = tuple(zip(mins, maxs)) if dims else None
+
+        object.__setattr__(self, "_min", mins)
+        object.__setattr__(self, "_max", maxs)
+        object.__setattr__(self, "_is_bounded", is_bounded)
+        object.__setattr__(self, "_is_fixed", is_fixed)
+        object.__setattr__(self, "_is_ragged", is_ragged)
+        object.__setattr__(self, "_as_tuple", as_tuple)
+        object.__setattr__(self, "_hash", hash((dims,)))
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"cannot assign to field '{name}'")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"cannot delete field '{name}'")
 
     def __eq__(self, other):
         """
@@ -99,36 +330,60 @@ class Shape:
         This definition of equality allows an unknown shape with `dims is None` to be
         considered equal or compatible with a known shape with `dims is not None`.
         """
+        if self is other:
+            return True
+
         if not isinstance(other, Shape):
             return False
 
-        if self.dims is None or other.dims is None:
+        dims, other_dims = self.dims, other.dims
+        if dims is None or other_dims is None:
             return True
 
-        return self.dims == other.dims
+        # Equal known shapes have equal hashes, so differing ones rule out equality
+        # without comparing the dimensions one by one
+        if self._hash != other._hash:
+            return False
+
+        return dims == other_dims
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"{self.__class__.__qualname__}(dims={self.dims!r})"
+
+    def __reduce__(self):
+        return (self._new_unchecked, (self.dims,))
+
+    def __setstate__(self, state):
+        # Pickles made when `Shape` was a dataclass restore
+        # its fields from a dict, so these are still loadable
+        object.__setattr__(self, "dims", state["dims"])
+        self._compute_derived()
 
     def __iter__(self):
-        return self.dims
+        return iter(self.dims) if self.dims is not None else iter(())
 
     @property
     def min(self) -> Tuple:
-        return tuple(dim.min for dim in self.dims)
+        return self._min
 
     @property
     def max(self) -> Tuple:
-        return tuple(dim.max for dim in self.dims)
+        return self._max
 
     @property
     def is_bounded(self):
-        return all(dim.is_bounded for dim in self.dims)
+        return self._is_bounded
 
     @property
     def is_fixed(self):
-        return all(dim.is_fixed for dim in self.dims)
+        return self._is_fixed
 
     @property
     def is_variable(self):
-        return not self.is_fixed
+        return not self._is_fixed
 
     @property
     def is_list(self):
@@ -136,8 +391,8 @@ class Shape:
 
     @property
     def is_ragged(self):
-        return self.is_list and any(dim.min != dim.max for dim in self.dims[1:])
+        return self._is_ragged
 
     @property
     def as_tuple(self):
-        return ((dim.min, dim.max) for dim in self.dims) if self.dims else None
+        return self._as_tuple
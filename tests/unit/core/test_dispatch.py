@@ -44,3 +44,17 @@ def test_concat_columns(device):
     data_frames = [df1, df2]
     res = concat_columns(data_frames)
     assert res.columns.to_list() == ["a", "b", "c"]
+
+
+@pytest.mark.parametrize("device", _DEVICES)
+def test_concat_columns_resets_index(device):
+    df1 = make_df({"a": [1, 2, 3]}, device=device)
+    df2 = make_df({"b": [4, 5, 6]}, device=device)
+    df2.index = df2.index + 10
+
+    res = concat_columns([df1, df2])
+
+    assert res.index.to_numpy().tolist() == [0, 1, 2]
+    assert res["b"].to_numpy().tolist() == [4, 5, 6]
+    # the inputs are left untouched
+    assert df2.index.to_numpy().tolist() == [10, 11, 12]
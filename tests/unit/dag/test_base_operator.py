@@ -13,12 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import numpy as np
 import pytest
 
 from merlin.dag.base_operator import BaseOperator as Operator
+from merlin.dag.base_operator import Supports
 from merlin.dag.graph import Graph
 from merlin.dag.selector import ColumnSelector
-from merlin.schema import Schema
+from merlin.schema import ColumnSchema, Schema
 
 
 @pytest.mark.parametrize("engine", ["parquet"])
@@ -76,3 +78,85 @@ def test_compute_output_schema_validates_schemas(dataset, engine):
         op.compute_output_schema(schema, selector)
 
     assert "Missing column" in str(exc_info.value)
+
+
+@pytest.mark.parametrize("dtype", [None, np.float64])
+def test_compute_output_schema_matches_overridable_methods(dtype):
+    class FusedOperator(Operator):
+        output_dtype = dtype
+        output_tags = ["output"]
+        output_properties = {"extra": 1}
+
+    class OverridingOperator(FusedOperator):
+        def _compute_tags(self, col_schema, input_schema):
+            return super()._compute_tags(col_schema, input_schema)
+
+    schema = Schema(
+        [
+            ColumnSchema("a", dtype=np.int32, tags=["input"], properties={"source": "a"}),
+            ColumnSchema("b", dtype=np.int64, is_list=True, is_ragged=True),
+        ]
+    )
+    selector = ColumnSelector(["a", "b"])
+
+    fused_schema = FusedOperator().compute_output_schema(schema, selector)
+    expected_schema = OverridingOperator().compute_output_schema(schema, selector)
+
+    assert fused_schema == expected_schema
+    assert set(fused_schema["a"].tags) == {"input", "output"}
+    assert fused_schema["a"].properties["extra"] == 1
+
+
+def test_compute_output_schema_resolves_output_metadata_once():
+    class CountingOperator(Operator):
+        lookups = 0
+
+        @property
+        def output_properties(self):
+            CountingOperator.lookups += 1
+            return {"domain": {"min": 0, "max": CountingOperator.lookups}}
+
+    op = CountingOperator()
+    schema = Schema([ColumnSchema(name, dtype=np.int64) for name in ["a", "b", "c"]])
+
+    output_schema = op.compute_output_schema(schema, ColumnSelector(["a", "b", "c"]))
+    assert CountingOperator.lookups == 1
+    assert all(col.properties["domain"]["max"] == 1 for col in output_schema)
+
+    # later calls pick up changes to the operator's output metadata
+    output_schema = op.compute_output_schema(schema, ColumnSelector(["a", "b", "c"]))
+    assert all(col.properties["domain"]["max"] == 2 for col in output_schema)
+
+
+def test_validate_matching_cols_checks_subgroups_and_ignores_tags():
+    op = Operator()
+    schema = Schema([ColumnSchema("a", tags=["x"]), ColumnSchema("b")])
+
+    op._validate_matching_cols(schema, ColumnSelector("*"), "test")
+    op._validate_matching_cols(schema, ColumnSelector(tags=["y"]), "test")
+    op._validate_matching_cols(schema, ColumnSelector(["a", ("a", "b")]), "test")
+
+    with pytest.raises(ValueError) as exc_info:
+        op._validate_matching_cols(schema, ColumnSelector(["a", ("b", "c")]), "test")
+
+    assert "Missing columns ['c']" in str(exc_info.value)
+
+
+def test_default_column_mapping():
+    column_mapping = Operator().column_mapping(ColumnSelector(["a", "b"]))
+
+    assert isinstance(column_mapping, dict)
+    assert column_mapping == {"a": ["a"], "b": ["b"]}
+    assert list(column_mapping.items()) == [("a", ["a"]), ("b", ["b"])]
+
+
+def test_supports():
+    class DictArrayOperator(Operator):
+        @property
+        def supports(self):
+            return Supports.CPU_DICT_ARRAY
+
+    assert Supports.CPU_DATAFRAME in Operator().supports
+    assert Supports.GPU_DATAFRAME in Operator.supports
+    assert Supports.CPU_DICT_ARRAY not in Operator().supports
+    assert DictArrayOperator().supports == Supports.CPU_DICT_ARRAY
@@ -14,13 +14,18 @@
 # limitations under the License.
 #
 
+import pickle
+
+import dask.dataframe as dd
 import numpy as np
 import pandas as pd
+import pytest
+from dask.distributed import Client, LocalCluster
 
 from merlin.core.dispatch import make_df
 from merlin.dag import DictArray, Graph
 from merlin.dag.base_operator import BaseOperator
-from merlin.dag.executors import LocalExecutor
+from merlin.dag.executors import DaskExecutor, LocalExecutor
 from merlin.schema.schema import ColumnSchema, Schema
 
 
@@ -55,3 +60,232 @@ def test_local_executor_with_dataframe_like():
 
     assert all(result["a"] == df["a"])
     assert "b" not in result.columns
+
+
+def test_local_executor_runs_shared_nodes_once():
+    df = make_df({"a": [1, 2, 3], "b": [4, 5, 6]})
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+
+    class CountingOperator(BaseOperator):
+        calls = 0
+
+        def transform(self, col_selector, transformable):
+            CountingOperator.calls += 1
+            return transformable
+
+    shared = ["a", "b"] >> CountingOperator()
+    left = shared["a"] >> BaseOperator()
+    right = shared["b"] >> BaseOperator()
+    graph = Graph(left + right)
+    graph.construct_schema(schema)
+
+    executor = LocalExecutor()
+    result = executor.transform(df, graph)
+
+    assert CountingOperator.calls == 1
+    assert sorted(result.columns) == ["a", "b"]
+
+
+def test_local_executor_with_thread_pool():
+    df = make_df({"a": [1, 2, 3], "b": [4, 5, 6], "c": [7, 8, 9]})
+    schema = Schema([ColumnSchema(name, dtype=np.int64) for name in ["a", "b", "c"]])
+
+    class CountingOperator(BaseOperator):
+        calls = 0
+
+        def transform(self, col_selector, transformable):
+            CountingOperator.calls += 1
+            return transformable
+
+    shared = ["a", "b", "c"] >> CountingOperator()
+    branches = [shared[name] >> BaseOperator() for name in ["a", "b", "c"]]
+    graph = Graph(branches[0] + branches[1] + branches[2])
+    graph.construct_schema(schema)
+
+    executor = pickle.loads(pickle.dumps(LocalExecutor(max_workers=4)))
+    result = executor.transform(df, graph)
+
+    assert CountingOperator.calls == 1
+    assert sorted(result.columns) == ["a", "b", "c"]
+    assert result.equals(LocalExecutor().transform(df, graph))
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_local_executor_subclass_without_super_init(max_workers):
+    df = make_df({"a": [1, 2, 3], "b": [4, 5, 6]})
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+    graph = Graph((["a"] >> BaseOperator()) + (["b"] >> BaseOperator()))
+    graph.construct_schema(schema)
+
+    class CustomExecutor(LocalExecutor):
+        def __init__(self):  # pylint: disable=super-init-not-called
+            if max_workers:
+                self.max_workers = max_workers
+
+    result = CustomExecutor().transform(df, graph)
+
+    assert sorted(result.columns) == ["a", "b"]
+
+
+@pytest.mark.parametrize("max_workers", [None, 4])
+def test_local_executor_isolates_shared_parent_output(max_workers):
+    df = make_df({"a": [1, 2, 3]})
+    schema = Schema([ColumnSchema("a", dtype=np.int64)])
+
+    class InPlaceDoubleOperator(BaseOperator):
+        def transform(self, col_selector, transformable):
+            transformable["a"] *= 2
+            return transformable
+
+    class RenameOperator(BaseOperator):
+        def __init__(self, postfix):
+            super().__init__()
+            self.postfix = postfix
+
+        def transform(self, col_selector, transformable):
+            return transformable.rename(columns={"a": "a" + self.postfix})
+
+        def column_mapping(self, col_selector):
+            return {name + self.postfix: [name] for name in col_selector.names}
+
+    shared = ["a"] >> BaseOperator()
+    left = shared >> InPlaceDoubleOperator() >> RenameOperator("_x")
+    right = shared >> RenameOperator("_y")
+    graph = Graph(left + right)
+    graph.construct_schema(schema)
+
+    result = LocalExecutor(max_workers=max_workers).transform(df, graph)
+
+    # the in-place change on one branch doesn't leak into its sibling or the input
+    assert result["a_x"].tolist() == [2, 4, 6]
+    assert result["a_y"].tolist() == [1, 2, 3]
+    assert df["a"].tolist() == [1, 2, 3]
+
+
+def test_dask_executor_drops_unused_columns():
+    df = make_df({"a": [1, 2, 3], "b": [4, 5, 6], "c": [7, 8, 9]})
+    ddf = dd.from_pandas(df, npartitions=2)
+    schema = Schema([ColumnSchema(name, dtype=np.int64) for name in ["a", "b", "c"]])
+
+    partition_columns = []
+
+    class RecordingExecutor(LocalExecutor):
+        def transform(self, transformable, graph, **kwargs):
+            partition_columns.append(list(transformable.columns))
+            return super().transform(transformable, graph, **kwargs)
+
+    graph = Graph(["a"] >> BaseOperator())
+    graph.construct_schema(schema)
+
+    executor = DaskExecutor()
+    executor._executor = RecordingExecutor()
+    result = executor.transform(ddf, graph, additional_columns=["b"]).compute()
+
+    assert list(result.columns) == ["a", "b"]
+    assert result.reset_index(drop=True).equals(df[["a", "b"]])
+    assert partition_columns and all(cols == ["a", "b"] for cols in partition_columns)
+
+
+def test_dask_executor_with_dataframe():
+    df = make_df({"a": [1, 2, 3], "b": [4, 5, 6]})
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+    graph = Graph(["a"] >> BaseOperator())
+    graph.construct_schema(schema)
+
+    result = DaskExecutor().transform(df, graph, additional_columns=["b"])
+
+    assert not isinstance(result, dd.DataFrame)
+    assert result.equals(df[["a", "b"]])
+
+
+@pytest.mark.parametrize("row_filter", [True, False])
+def test_dask_executor_coalesces_filtered_partitions(row_filter):
+    df = make_df({"a": list(range(8))})
+    ddf = dd.from_pandas(df, npartitions=4)
+    schema = Schema([ColumnSchema("a", dtype=np.int64)])
+
+    class FilterOperator(BaseOperator):
+        is_row_filter = row_filter
+
+        def transform(self, col_selector, transformable):
+            return transformable[transformable["a"] % 4 == 0]
+
+    graph = Graph(["a"] >> FilterOperator())
+    graph.construct_schema(schema)
+
+    result = DaskExecutor(filter_coalesce_factor=2).transform(ddf, graph)
+
+    assert result.npartitions == (2 if row_filter else 4)
+    assert result.compute()["a"].tolist() == [0, 4]
+
+
+def test_local_executor_applies_predicates():
+    df = make_df({"a": [1, 2, 3, 4], "b": [5, 6, 7, 8]})
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+
+    class PredicateOperator(BaseOperator):
+        is_row_filter = True
+
+        def as_predicate(self):
+            return ("a", ">=", 3)
+
+        def transform(self, col_selector, transformable):
+            raise NotImplementedError("the predicate should be applied instead")
+
+    graph = Graph(["a", "b"] >> PredicateOperator())
+    graph.construct_schema(schema)
+
+    result = LocalExecutor().transform(df, graph)
+
+    assert result["a"].tolist() == [3, 4]
+    assert result["b"].tolist() == [7, 8]
+
+
+def test_dask_executor_with_client():
+    df = make_df({"a": list(range(8)), "b": list(range(8, 16))})
+    ddf = dd.from_pandas(df, npartitions=4)
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+    graph = Graph(["a"] >> BaseOperator())
+    graph.construct_schema(schema)
+
+    with LocalCluster(n_workers=1, processes=False) as cluster, Client(cluster):
+        result = DaskExecutor().transform(ddf, graph, additional_columns=["b"]).compute()
+
+    assert result.reset_index(drop=True).equals(df)
+
+
+_UNPICKLED_OPERATORS = []
+
+
+def _unpickle_counting_operator():
+    _UNPICKLED_OPERATORS.append(1)
+    return CountingOperator()
+
+
+def _count_unpickled_operators():
+    return len(_UNPICKLED_OPERATORS)
+
+
+class CountingOperator(BaseOperator):
+    def __reduce__(self):
+        return (_unpickle_counting_operator, ())
+
+
+def test_dask_executor_sends_graph_once_per_worker(client):
+    df = make_df({"a": list(range(16)), "b": list(range(16, 32))})
+    ddf = dd.from_pandas(df, npartitions=8)
+    schema = Schema([ColumnSchema("a", dtype=np.int64), ColumnSchema("b", dtype=np.int64)])
+    graph = Graph(["a"] >> CountingOperator())
+    graph.construct_schema(schema)
+
+    transformed = DaskExecutor().transform(ddf, graph)
+
+    # The graph is broadcast to the workers up front, instead of with each task
+    assert all(client.has_what().values())
+
+    result = transformed.compute()
+
+    assert result["a"].tolist() == list(range(16))
+    # Each worker unpickles the graph once, rather than once per partition
+    unpickled = client.run(_count_unpickled_operators)
+    assert sum(unpickled.values()) <= len(unpickled) < ddf.npartitions
@@ -13,10 +13,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import gc
+
 import numpy
+import pandas as pd
 import pytest
 
 import merlin.dtypes as md
+from merlin.dtypes.mappings import cudf as cudf_mappings
 
 
 @pytest.mark.parametrize("python_type, merlin_type", [(int, md.int64)])
@@ -46,3 +50,26 @@ def test_unknown_types_raise_error():
 
     with pytest.raises(TypeError):
         md.dtype(UnknownType)
+
+
+class FakeCategoricalDtype:
+    # Stands in for `cudf.CategoricalDtype`, which only needs its categories
+    def __init__(self, categories):
+        self._categories = pd.Index(categories)
+
+
+@pytest.mark.parametrize(
+    "categories, expected", [(["a", "b"], numpy.dtype("str")), ([1, 2], numpy.dtype("int64"))]
+)
+def test_cudf_translator_translates_categories(categories, expected):
+    raw_dtype = FakeCategoricalDtype(categories)
+
+    assert cudf_mappings.cudf_translator(raw_dtype) == expected
+    # the translation is cached until the dtype is garbage collected
+    assert id(raw_dtype) in cudf_mappings._translated_dtypes
+    assert cudf_mappings.cudf_translator(raw_dtype) == expected
+
+    key = id(raw_dtype)
+    del raw_dtype
+    gc.collect()
+    assert key not in cudf_mappings._translated_dtypes
@@ -13,6 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import pickle
+from collections import namedtuple
+from dataclasses import FrozenInstanceError
+
+import numpy as np
 import pytest
 
 import merlin.dtypes as md
@@ -63,6 +68,14 @@ def test_max_less_than_min():
     with pytest.raises(ValueError):
         Dimension(2, 1)
 
+    with pytest.raises(ValueError):
+        Dimension(2, 0)
+
+    with pytest.raises(ValueError):
+        Shape((3, (1, 0)))
+
+    assert Dimension(0, 0).is_fixed
+
 
 def test_is_bounded():
     dim = Dimension()
@@ -115,6 +128,32 @@ def test_is_variable():
     assert dim.is_variable is True
 
 
+def test_dimension_is_immutable():
+    dim = Dimension(2, 4)
+
+    with pytest.raises(FrozenInstanceError):
+        dim.min = 3
+
+    assert dim == Dimension(2, 4)
+    assert hash(dim) == hash(Dimension(2, 4))
+    assert dim != Dimension(2, 5)
+    assert pickle.loads(pickle.dumps(dim)) == dim
+
+
+def test_dimension_loads_legacy_pickles():
+    # A `Dimension(2, 5)` pickled when it was a frozen dataclass
+    legacy = (
+        b"\x80\x04\x95=\x00\x00\x00\x00\x00\x00\x00\x8c\x13merlin.dtypes.shape\x94"
+        b"\x8c\tDimension\x94\x93\x94)\x81\x94}\x94(\x8c\x03min\x94K\x02\x8c\x03max\x94K\x05ub."
+    )
+    dim = pickle.loads(legacy)
+
+    assert dim == Dimension(2, 5)
+    assert hash(dim) == hash(Dimension(2, 5))
+    assert dim.is_bounded is True
+    assert dim.is_fixed is False
+
+
 # Shape
 
 
@@ -220,3 +259,127 @@ def test_dtype_with_shape():
     dtype = md.int32.with_shape((3, 4, 5))
     assert dtype.shape != (3, 4, 5)
     assert dtype.shape == Shape((3, 4, 5))
+
+
+def test_shape_derived_values():
+    shape = Shape((5, (2, None), 4))
+    assert shape.min == (5, 2, 4)
+    assert shape.max == (5, None, 4)
+    assert shape.as_tuple == ((5, 5), (2, None), (4, 4))
+    assert Shape(shape.as_tuple) == shape
+
+    assert Shape().as_tuple is None
+    assert Shape(()).as_tuple is None
+
+
+def test_shape_is_immutable():
+    shape = Shape((5, 1))
+
+    with pytest.raises(FrozenInstanceError):
+        shape.dims = (1, 5)
+
+    assert hash(shape) == hash(Shape((5, 1)))
+    assert pickle.loads(pickle.dumps(shape)) == shape
+    assert pickle.loads(pickle.dumps(shape)).is_fixed is True
+
+
+def test_shape_loads_legacy_pickles():
+    # A `Shape((5, (2, None)))` pickled when it was a frozen dataclass
+    legacy = (
+        b"\x80\x04\x95j\x00\x00\x00\x00\x00\x00\x00\x8c\x13merlin.dtypes.shape\x94"
+        b"\x8c\x05Shape\x94\x93\x94)\x81\x94}\x94\x8c\x04dims\x94h\x00\x8c\tDimension\x94"
+        b"\x93\x94)\x81\x94}\x94(\x8c\x03min\x94K\x05\x8c\x03max\x94K\x05ubh\x07)\x81\x94}"
+        b"\x94(h\nK\x02h\x0bNub\x86\x94sb."
+    )
+    shape = pickle.loads(legacy)
+
+    assert shape == Shape((5, (2, None)))
+    assert hash(shape) == hash(Shape((5, (2, None))))
+    assert shape.max == (5, None)
+    assert shape.is_ragged is True
+
+
+def test_shape_iteration():
+    assert list(Shape((3, 4))) == [Dimension(3, 3), Dimension(4, 4)]
+    assert [dim.max for dim in Shape(((0, None), 2))] == [None, 2]
+    assert list(Shape()) == []
+
+
+def test_shapes_share_dimensions():
+    shape = Shape((None, 1, (2, 5)))
+    other = Shape(((0, None), (1, 1), (2, 5)))
+
+    assert all(dim is other_dim for dim, other_dim in zip(shape, other))
+    assert isinstance(Shape(((1.0, 2.0),)).dims[0].min, float)
+    assert Shape((True,)).dims[0].min is True
+
+
+def test_shape_from_shape_or_dimensions():
+    shape = Shape((5, (2, None)))
+
+    copied = Shape(shape)
+    assert copied == shape
+    assert copied.dims is shape.dims
+    assert copied.is_bounded is False
+    assert copied.as_tuple == shape.as_tuple
+
+    from_dims = Shape(shape.dims)
+    assert from_dims == shape
+    assert from_dims.max == (5, None)
+    assert from_dims.dims is shape.dims
+    assert Shape(list(shape.dims)).dims == shape.dims
+
+
+def test_unchecked_constructors():
+    dims = (Dimension(5, 5), Dimension(2, None))
+    shape = Shape._new_unchecked(dims)
+
+    assert shape == Shape(dims)
+    assert shape.dims is dims
+    assert shape.is_bounded is False
+    assert Dimension._new_unchecked(2, 4) == Dimension(2, 4)
+
+
+def test_shape_accepts_subclasses_of_dimension_formats():
+    Bounds = namedtuple("Bounds", ["min", "max"])
+
+    shape = Shape((Bounds(1, 3), True))
+
+    assert shape == Shape(((1, 3), (1, 1)))
+
+
+def test_shape_from_arrays():
+    shape = Shape.from_arrays(np.array([0, 2, 3]), np.array([-1, 2, 5]))
+
+    assert shape == Shape(((0, None), 2, (3, 5)))
+    assert shape.max == (None, 2, 5)
+    assert shape.is_ragged is True
+    assert Shape.from_arrays([], []) == Shape(())
+
+    with pytest.raises(ValueError) as exc_info:
+        Shape.from_arrays([0, 3], [-1, 2])
+    assert "at least as large as the minimum" in str(exc_info.value)
+
+    with pytest.raises(ValueError):
+        Shape.from_arrays([-1], [2])
+
+    with pytest.raises(ValueError):
+        Shape.from_arrays([1], [-2])
+
+    with pytest.raises(ValueError):
+        Shape.from_arrays([1, 2], [3])
+
+
+def test_shape_equality_uses_cached_hash():
+    shape = Shape((5, (2, None)))
+
+    assert shape == shape
+    assert shape == Shape(((5, 5), (2, None)))
+    assert shape != Shape((5, (2, 3)))
+    assert shape == Shape() and Shape() == shape
+    assert hash(Shape(shape)) == hash(shape)
+    assert hash(pickle.loads(pickle.dumps(shape))) == hash(shape)
+
+    assert Dimension(1, 2) == Dimension(1.0, 2.0)
+    assert Dimension(1, 2) != Dimension(1, 3)
+    assert hash(Dimension(1, 2)) == hash(Dimension(1.0, 2.0))
@@ -13,10 +13,34 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import functools
+import gzip
+import hashlib
+import http.server
+import io
+import os
+import stat
+import tarfile
+import threading
+import zipfile
 
+import dask.dataframe as dd
+import pandas as pd
 import pytest
+from dask.highlevelgraph import HighLevelGraph
 
-from merlin.core.utils import Distributed, Serial, global_dask_client, set_dask_client
+from merlin.core import utils
+from merlin.core.utils import (
+    Distributed,
+    Serial,
+    download_file,
+    ensure_optimize_dataframe_graph,
+    get_rmm_size,
+    global_dask_client,
+    run_on_worker,
+    run_on_workers,
+    set_dask_client,
+)
 
 try:
     import cudf
@@ -28,6 +52,153 @@ except ImportError:
 _HAS_GPU = cudf is not None
 
 
+@pytest.mark.parametrize("size", [0, 255, 256, 1000, 2**33 + 17, 0.8 * 1e9])
+def test_get_rmm_size(size):
+    rmm_size = get_rmm_size(size)
+    assert rmm_size == (int(size) // 256) * 256
+    assert isinstance(rmm_size, int)
+
+
+@pytest.fixture
+def http_dir(tmpdir):
+    serve_dir = tmpdir.mkdir("serve")
+    handler = functools.partial(http.server.SimpleHTTPRequestHandler, directory=str(serve_dir))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield serve_dir, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("size", [1024, 3 * 1024 * 1024 + 7])
+def test_download_file(tmpdir, http_dir, size):
+    serve_dir, base_url = http_dir
+    payload = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+    with gzip.open(str(serve_dir.join("data.csv.gz")), "wb") as f:
+        f.write(payload)
+
+    local_filename = str(tmpdir.join("download", "data.csv.gz"))
+    download_file(f"{base_url}/data.csv.gz", local_filename)
+
+    with open(local_filename[:-3], "rb") as f:
+        assert f.read() == payload
+
+
+@pytest.mark.parametrize("backend", ["requests", "urllib"])
+def test_download_file_backends_write_the_same_bytes(tmpdir, monkeypatch, backend):
+    payload = b"1,2,3\n" * 1000
+    encoded = gzip.compress(payload)
+
+    class GzipEncodingHandler(http.server.BaseHTTPRequestHandler):
+        # Always applies a content encoding, whatever the client asked for
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(encoded)))
+            self.end_headers()
+            self.wfile.write(encoded)
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), GzipEncodingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    if backend == "urllib":
+        monkeypatch.setattr(utils, "_requests_session", lambda: None)
+
+    try:
+        local_filename = tmpdir.join("download", "data.csv")
+        url = f"http://127.0.0.1:{server.server_address[1]}/data.csv"
+        download_file(url, str(local_filename), expected_sha256=hashlib.sha256(encoded).hexdigest())
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert local_filename.read_binary() == encoded
+
+
+def test_download_file_sha256(tmpdir, http_dir):
+    serve_dir, base_url = http_dir
+    payload = b"1,2,3\n" * 1000
+    serve_dir.join("data.csv").write_binary(payload)
+    url = f"{base_url}/data.csv"
+    sha256 = hashlib.sha256(payload).hexdigest()
+
+    local_filename = tmpdir.join("download", "data.csv")
+    with pytest.raises(ValueError):
+        download_file(url, str(local_filename), expected_sha256="0" * 64)
+    assert not local_filename.exists()
+
+    umask = os.umask(0o027)
+    try:
+        download_file(url, str(local_filename), expected_sha256=sha256)
+    finally:
+        os.umask(umask)
+    assert local_filename.read_binary() == payload
+    # The file is created with the permissions the umask allows
+    assert stat.S_IMODE(os.stat(str(local_filename)).st_mode) == 0o640
+
+    # An existing file that fails verification is downloaded again
+    local_filename.write_binary(b"corrupted")
+    download_file(url, str(local_filename), redownload=False, expected_sha256=sha256)
+    assert local_filename.read_binary() == payload
+
+
+def test_download_file_no_redownload(tmpdir, http_dir):
+    serve_dir, base_url = http_dir
+    serve_dir.join("data.csv").write_binary(b"a,b\n")
+
+    local_filename = tmpdir.join("download", "data.csv")
+    local_filename.dirpath().ensure(dir=True)
+    local_filename.write_binary(b"existing")
+    download_file(f"{base_url}/data.csv", str(local_filename), redownload=False)
+    assert local_filename.read_binary() == b"existing"
+
+    # Failed downloads don't leave a partial file behind
+    with pytest.raises(Exception):
+        download_file(f"{base_url}/missing.csv", str(tmpdir.join("download", "missing.csv")))
+    assert not tmpdir.join("download", "missing.csv").exists()
+
+    # Failed redownloads keep the existing file
+    with pytest.raises(Exception):
+        download_file(f"{base_url}/missing.csv", str(local_filename))
+    assert local_filename.read_binary() == b"existing"
+    assert sorted(p.basename for p in local_filename.dirpath().listdir()) == ["data.csv"]
+
+
+def test_download_file_zip(tmpdir, http_dir):
+    serve_dir, base_url = http_dir
+    files = {"ml/ratings.csv": b"1,2,3\n" * 1000, "ml/movies.csv": b"a,b\n", "README": b"hi"}
+    with zipfile.ZipFile(str(serve_dir.join("ml.zip")), "w") as z:
+        z.writestr("ml/", b"")
+        for name, data in files.items():
+            z.writestr(name, data)
+
+    download_dir = tmpdir.join("download")
+    download_file(f"{base_url}/ml.zip", str(download_dir.join("ml.zip")))
+
+    for name, data in files.items():
+        with open(str(download_dir.join(name)), "rb") as f:
+            assert f.read() == data
+
+
+def test_download_file_tgz(tmpdir, http_dir):
+    serve_dir, base_url = http_dir
+    files = {"ml/ratings.csv": b"1,2,3\n" * 1000, "ml/movies.csv": b"a,b\n"}
+    with tarfile.open(str(serve_dir.join("ml.tgz")), "w:gz") as tar:
+        for name, data in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+    download_dir = tmpdir.join("download")
+    download_file(f"{base_url}/ml.tgz", str(download_dir.join("ml.tgz")))
+
+    for name, data in files.items():
+        with open(str(download_dir.join(name)), "rb") as f:
+            assert f.read() == data
+
+
 @pytest.mark.parametrize("cpu", _CPU)
 def test_serial_context(client, cpu):
     # Set distributed client
@@ -120,3 +291,50 @@ def test_nvt_distributed_force(client, cpu):
     # We should revert to the original client
     # outside the `with Distributed()` block
     assert global_dask_client() == client
+
+
+@pytest.mark.parametrize("use_client", [True, False])
+def test_run_on_worker(client, use_client):
+    def add(x, y=0, key=None):
+        return x + y, key
+
+    set_dask_client(client=client if use_client else None)
+    try:
+        assert run_on_worker(add, 1, y=2, key="k") == (3, "k")
+    finally:
+        set_dask_client(client="auto")
+
+
+@pytest.mark.parametrize("use_client", [True, False])
+def test_run_on_workers(client, use_client):
+    def add(x, y=0):
+        return x + y
+
+    set_dask_client(client=client if use_client else None)
+    try:
+        results = run_on_workers([(add, (1,)), (add, (2,), {"y": 3}), (len, ([1, 2, 3],))])
+        assert results == [1, 5, 3]
+    finally:
+        set_dask_client(client="auto")
+
+
+def test_ensure_optimize_dataframe_graph_returns_high_level_graphs():
+    df = pd.DataFrame({"a": range(10), "b": range(10)})
+    ddf = dd.from_pandas(df, npartitions=2)
+
+    # Graphs without layers that combine others keep their layers
+    filtered = ddf[ddf["a"] > 2]
+    optimized = ensure_optimize_dataframe_graph(ddf=filtered)
+    assert isinstance(optimized.dask, HighLevelGraph)
+    assert any(name.startswith("from_pandas-") for name in optimized.dask.layers)
+    assert optimized.compute()["a"].tolist() == list(range(3, 10))
+
+    # Graphs that are fused at the task level are still returned as HLGs
+    stacked = dd.concat([ddf, ddf])
+    stacked = stacked[stacked["a"] > 7]
+    graph = ensure_optimize_dataframe_graph(dsk=stacked.dask, keys=stacked.__dask_keys__())
+    assert isinstance(graph, HighLevelGraph)
+
+    optimized = ensure_optimize_dataframe_graph(ddf=stacked)
+    assert isinstance(optimized.dask, HighLevelGraph)
+    assert optimized.compute()["a"].tolist() == [8, 9, 8, 9]